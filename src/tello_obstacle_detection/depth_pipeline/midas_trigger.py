@@ -2,8 +2,10 @@ import cv2
 import torch
 import numpy as np
 import time
+import logging
 from dotenv import load_dotenv
 from djitellopy import Tello
+from tello_obstacle_detection.depth_pipeline.trt_engine import trt_available, load_or_build_engine
 
 import os, sys
 
@@ -15,30 +17,156 @@ sys.path.insert(0, midas_root)
 from midas.model_loader import load_model, default_models
 from run import process, run
 
+logger = logging.getLogger(__name__)
+
 # Import env Virables
 load_dotenv()
 model_type = os.getenv("MODEL_NAME")
 
-def init_depth_model(device, model_weights, model_type, optimize=False):
-    """Load MiDaS model and preprocessing pipeline."""
+def init_depth_model(device, model_weights, model_type, optimize=False, trt_cache_dir=None):
+    """
+    Load MiDaS model and preprocessing pipeline.
+
+    When trt_cache_dir is given and TensorRT is available on a CUDA device, the model
+    is replaced by a TensorRT FP16 engine cached in that directory (built on first use).
+    Otherwise the PyTorch model is returned, converted to FP16 channels_last on CUDA.
+    """
     model, transform, net_w, net_h = load_model(device, model_weights, model_type, optimize)
+    if trt_cache_dir and trt_available(device):
+        try:
+            model = load_or_build_engine(model, device, model_type, net_w, net_h, trt_cache_dir)
+            return model, transform, net_w, net_h
+        except Exception as e:
+            logger.warning("[DepthModel] TensorRT unavailable, using PyTorch: %s", e)
+    if device.type == "cuda":
+        model = model.to(memory_format=torch.channels_last).half()
+        model = compile_depth_model(model, device, net_w, net_h)
     return model, transform, net_w, net_h
 
+def compile_depth_model(model, device, net_w, net_h, batch_size=1, warmup_runs=2):
+    """
+    torch.compile the MiDaS model and run warm-up inferences so the first real frame
+    does not pay the compile cost. mode="reduce-overhead" already replays CUDA graphs;
+    if compilation fails, a manually captured CUDAGraphModel is tried, then the eager model.
+    """
+    compiled = torch.compile(model, mode="reduce-overhead", fullgraph=False)
+    dummy = torch.zeros((batch_size, 3, net_h, net_w), device=device)
+    try:
+        for _ in range(warmup_runs):
+            infer_on_gpu(device, compiled, dummy, (net_h, net_w))
+        return compiled
+    except Exception as e:
+        logger.warning("[DepthModel] torch.compile failed: %s", e)
+
+    try:
+        example = dummy.to(memory_format=torch.channels_last, dtype=torch.float16)
+        return CUDAGraphModel(model, example)
+    except Exception as e:
+        logger.warning("[DepthModel] CUDA graph capture failed, using eager model: %s", e)
+        return model
+
+class CUDAGraphModel:
+    """Replays a CUDA graph of the MiDaS forward pass captured for one fixed input shape."""
+    def __init__(self, model, example_input, warmup_runs=2):
+        self.model = model
+        self.static_input = example_input.clone()
+
+        # Warm up on a side stream before capture, as torch.cuda.graph requires
+        side = torch.cuda.Stream()
+        side.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(side), torch.inference_mode():
+            with torch.autocast("cuda", dtype=torch.float16, cache_enabled=False):
+                for _ in range(warmup_runs):
+                    model.forward(self.static_input)
+        torch.cuda.current_stream().wait_stream(side)
+
+        self.graph = torch.cuda.CUDAGraph()
+        with torch.inference_mode(), torch.cuda.graph(self.graph):
+            with torch.autocast("cuda", dtype=torch.float16, cache_enabled=False):
+                self.static_output = model.forward(self.static_input)
+
+    def forward(self, sample):
+        if sample.shape != self.static_input.shape:
+            return self.model.forward(sample)
+        self.static_input.copy_(sample)
+        self.graph.replay()
+        return self.static_output.clone()
+
 def capture_tello_frame(tello: Tello, timeout_s=5.0):
     """Return an RGB frame from Tello’s video stream."""
     start = time.time()
     while time.time() - start < timeout_s:
         frame = tello.get_frame_read().frame  # BGR
         if frame is not None:
+            # One contiguous RGB copy: cheaper than the strided reads every consumer
+            # (CPU transform, GPU upload, OpenCV drawing) would otherwise pay on a view
             return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         time.sleep(0.05)
     raise RuntimeError("Failed to get frame from Tello within timeout.")
 
+# MiDaS models whose transform resizes straight to (net_w, net_h) and normalizes
+# with mean = std = 0.5, so their preprocessing can be reproduced on the GPU
+GPU_PREPROCESS_MODELS = {
+    "dpt_swin2_tiny_256",
+    "dpt_swin2_base_384",
+    "dpt_swin2_large_384",
+    "dpt_swin_large_384",
+}
+
+# Pinned host / device buffer pairs for frame uploads, keyed by (device, frame shape).
+# Reused every frame, so the per-frame upload allocates nothing on either side
+_upload_buffers = {}
+
+def upload_frame(device, frame):
+    """Copy a uint8 HxWx3 frame to the device through a reused pinned/device buffer pair."""
+    key = (device, frame.shape)
+    buffers = _upload_buffers.get(key)
+    if buffers is None:
+        host = torch.empty(frame.shape, dtype=torch.uint8, pin_memory=True)
+        buffers = _upload_buffers[key] = (host, torch.empty_like(host, device=device))
+    host, dev = buffers
+    # The previous frame's upload has finished: infer_on_gpu synchronizes on its .cpu() read
+    np.copyto(host.numpy(), frame)
+    return dev.copy_(host, non_blocking=True)
+
+def preprocess_on_gpu(device, image_rgb, net_w, net_h):
+    """Upload the uint8 RGB frame and scale, resize and normalize it on the GPU."""
+    sample = upload_frame(device, image_rgb)
+    sample = sample.permute(2, 0, 1).unsqueeze(0).to(torch.float16).mul_(1.0 / 255.0)
+    sample = torch.nn.functional.interpolate(
+        sample, size=(net_h, net_w), mode="bicubic", align_corners=False
+    )
+    return sample.sub_(0.5).div_(0.5)
+
+def infer_on_gpu(device, model, sample, target_size):
+    """
+    Run the MiDaS forward pass under FP16 autocast with a channels_last input,
+    then upsample the prediction to target_size (height, width) in FP32.
+    """
+    sample = sample.to(device, memory_format=torch.channels_last, dtype=torch.float16)
+    with torch.inference_mode():
+        with torch.autocast("cuda", dtype=torch.float16):
+            prediction = model.forward(sample)
+        prediction = torch.nn.functional.interpolate(
+            prediction.float().unsqueeze(1),
+            size=target_size,
+            mode="bicubic",
+            align_corners=False,
+        )
+    return prediction.squeeze().cpu().numpy()
+
 def get_depth_array_from_frame(
     device, model, model_type, transform, net_w, net_h, image_rgb, optimize
 ):
     """Run MiDaS inference on a single RGB frame and return the depth array."""
+    if device.type == "cuda" and model_type in GPU_PREPROCESS_MODELS:
+        sample = preprocess_on_gpu(device, image_rgb, net_w, net_h)
+        return infer_on_gpu(device, model, sample, image_rgb.shape[:2])
+
     image = transform({"image": image_rgb / 255.0})["image"]
+    if device.type == "cuda":
+        sample = torch.from_numpy(image).unsqueeze(0)
+        return infer_on_gpu(device, model, sample, image_rgb.shape[:2])
     with torch.no_grad():
         depth = process(
             device,
@@ -1,3 +1,4 @@
+import cv2
 import numpy as np
 
 def normalize_midas_depth(depth_map: np.ndarray) -> np.ndarray:
@@ -17,7 +18,9 @@ def normalize_midas_depth(depth_map: np.ndarray) -> np.ndarray:
     if max_val - min_val < 1e-6:
         return np.zeros_like(depth_map)
     
-    normalized = (depth_map - min_val) / (max_val - min_val)
+    # Single output allocation; scale in place instead of allocating a second temporary
+    normalized = np.subtract(depth_map, min_val, dtype=np.result_type(depth_map, np.float32))
+    normalized *= 1.0 / (max_val - min_val)
     return normalized
 
 def safe_direction(depth_norm: np.ndarray, near_thresh: float=0.35, min_free: float=0.65) -> str:
@@ -40,21 +43,58 @@ def safe_direction(depth_norm: np.ndarray, near_thresh: float=0.35, min_free: fl
     """
     h, w = depth_norm.shape
     y0, y1 = int(h*0.35), int(h*0.65)  # central forward band for drones
-    band = depth_norm[y0:y1, :]
-    blocked = band >= near_thresh  # MiDaS: larger ~ closer
-    free = ~blocked
-    thirds = [(0, w//3), (w//3, 2*w//3), (2*w//3, w)]
-    names = ["left","center","right"]
-    free_ratios = {}
-    for name, (x0, x1) in zip(names, thirds):
-        sector = free[:, x0:x1]
-        free_ratios[name] = float(sector.mean()) if sector.size else 0.0
-    # Priority: center > right > left
-    if free_ratios["center"] >= min_free:
-        return "center"
-    elif free_ratios["right"] >= min_free:
-        return "right"
-    elif free_ratios["left"] >= min_free:
-        return "left"
-    else:
-        return "none"
\ No newline at end of file
+    band = depth_norm[y0:y1, :]  # view, no copy
+    rows = y1 - y0
+    sectors = {"left": (0, w//3), "center": (w//3, 2*w//3), "right": (2*w//3, w)}
+    # Priority: center > right > left; later sectors are only scanned if needed
+    for name in ("center", "right", "left"):
+        x0, x1 = sectors[name]
+        size = rows * (x1 - x0)
+        # MiDaS: larger ~ closer, so free pixels sit below near_thresh
+        free_ratio = np.count_nonzero(band[:, x0:x1] < near_thresh) / size if size else 0.0
+        if free_ratio >= min_free:
+            return name
+    return "none"
+
+def downsample_depth(depth_map: np.ndarray, size: tuple[int, int]=(64, 64)) -> np.ndarray:
+    """
+    Area-average a depth map down to size and quantize it to uint8 over its min-max range.
+
+    Args:
+        depth_map (np.ndarray): Raw depth prediction from MiDaS.
+        size (tuple[int, int], optional): Output (width, height). Default is (64, 64).
+
+    Returns:
+        np.ndarray: uint8 depth map in [0, 255], larger ≈ closer.
+    """
+    small = cv2.resize(depth_map, size, interpolation=cv2.INTER_AREA)
+    return cv2.normalize(small, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+
+def safe_direction_from_depth(depth_map: np.ndarray, near_thresh: float=0.35, min_free: float=0.65, size: tuple[int, int] | None=None) -> str:
+    """
+    Same decision as safe_direction(normalize_midas_depth(depth_map), ...) without building
+    the normalized map: near_thresh is mapped back to raw MiDaS units once, so the depth
+    pixels are only read by the min/max reduction and the sector counts.
+
+    Args:
+        depth_map (np.ndarray): Raw depth prediction from MiDaS.
+        near_thresh (float, optional): Normalized threshold above which pixels are considered obstacles. Default is 0.35.
+        min_free (float, optional): Minimum fraction of free pixels required in a sector to deem it safe. Default is 0.65.
+        size (tuple[int, int], optional): If given, decide on a uint8 map downsampled to this
+            (width, height) with downsample_depth instead of the full-resolution map.
+
+    Returns:
+        str: One of {"center", "right", "left", "none"} indicating the safest direction.
+    """
+    if size is not None:
+        return safe_direction(downsample_depth(depth_map, size), near_thresh * 255, min_free)
+
+    min_val = np.min(depth_map)
+    max_val = np.max(depth_map)
+
+    # Uniform depth normalizes to all zeros
+    if max_val - min_val < 1e-6:
+        return safe_direction(np.zeros_like(depth_map), near_thresh, min_free)
+
+    raw_thresh = min_val + near_thresh * (max_val - min_val)
+    return safe_direction(depth_map, raw_thresh, min_free)
@@ -0,0 +1,130 @@
+import os
+import torch
+
+try:
+    import tensorrt as trt
+except ImportError:  # TensorRT is optional; callers fall back to the PyTorch model
+    trt = None
+
+INPUT_NAME = "image"
+OUTPUT_NAME = "depth"
+
+
+def trt_available(device) -> bool:
+    """Return True when a TensorRT engine can be used on this device."""
+    return trt is not None and device.type == "cuda"
+
+
+def engine_cache_path(cache_dir, model_type, net_w, net_h, precision="fp16", max_batch=16):
+    """Path of the serialized engine for a (model_type, shape, precision) combination."""
+    name = f"{model_type}_{net_w}x{net_h}_b{max_batch}_{precision}.engine"
+    return os.path.join(cache_dir, name)
+
+
+def export_onnx(model, onnx_path, net_w, net_h, device):
+    """Export the MiDaS model to ONNX with a dynamic batch dimension."""
+    dummy = torch.zeros((1, 3, net_h, net_w), device=device)
+    torch.onnx.export(
+        model,
+        dummy,
+        onnx_path,
+        input_names=[INPUT_NAME],
+        output_names=[OUTPUT_NAME],
+        dynamic_axes={INPUT_NAME: {0: "batch"}, OUTPUT_NAME: {0: "batch"}},
+        opset_version=17,
+    )
+    return onnx_path
+
+
+def build_trt_engine(onnx_path, engine_path, net_w, net_h, fp16=True, max_batch=16):
+    """
+    Build a TensorRT engine from an ONNX file and serialize it to engine_path.
+
+    Args:
+        onnx_path (str): ONNX model exported by export_onnx.
+        engine_path (str): Destination of the serialized engine.
+        net_w (int): Network input width.
+        net_h (int): Network input height.
+        fp16 (bool): Enable FP16 kernels. Default is True.
+        max_batch (int): Largest batch size covered by the optimization profile.
+
+    Returns:
+        str: engine_path.
+    """
+    if trt is None:
+        raise RuntimeError("TensorRT is not installed")
+
+    logger = trt.Logger(trt.Logger.WARNING)
+    builder = trt.Builder(logger)
+    network = builder.create_network(1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH))
+    parser = trt.OnnxParser(network, logger)
+    with open(onnx_path, "rb") as f:
+        if not parser.parse(f.read()):
+            errors = [str(parser.get_error(i)) for i in range(parser.num_errors)]
+            raise RuntimeError(f"Failed to parse {onnx_path}: {errors}")
+
+    config = builder.create_builder_config()
+    if fp16:
+        config.set_flag(trt.BuilderFlag.FP16)
+
+    profile = builder.create_optimization_profile()
+    profile.set_shape(
+        INPUT_NAME,
+        (1, 3, net_h, net_w),
+        (1, 3, net_h, net_w),
+        (max_batch, 3, net_h, net_w),
+    )
+    config.add_optimization_profile(profile)
+
+    serialized = builder.build_serialized_network(network, config)
+    if serialized is None:
+        raise RuntimeError("TensorRT engine build failed")
+    os.makedirs(os.path.dirname(engine_path) or ".", exist_ok=True)
+    with open(engine_path, "wb") as f:
+        f.write(serialized)
+    return engine_path
+
+
+class TRTDepthModel:
+    """Runs a serialized MiDaS TensorRT engine behind the same forward(tensor) contract as the PyTorch model."""
+    def __init__(self, engine_path, net_w, net_h, max_batch=16, device=None):
+        if trt is None:
+            raise RuntimeError("TensorRT is not installed")
+        self.device = device or torch.device("cuda")
+        self.max_batch = max_batch
+        runtime = trt.Runtime(trt.Logger(trt.Logger.WARNING))
+        with open(engine_path, "rb") as f:
+            self.engine = runtime.deserialize_cuda_engine(f.read())
+        self.context = self.engine.create_execution_context()
+        self.stream = torch.cuda.Stream(device=self.device)
+
+        # Device buffers sized for the largest batch; bound once
+        self._input = torch.empty((max_batch, 3, net_h, net_w), dtype=torch.float32, device=self.device)
+        self._output = torch.empty((max_batch, net_h, net_w), dtype=torch.float32, device=self.device)
+        self.context.set_tensor_address(INPUT_NAME, self._input.data_ptr())
+        self.context.set_tensor_address(OUTPUT_NAME, self._output.data_ptr())
+
+    def forward(self, sample):
+        b = sample.shape[0]
+        if b > self.max_batch:
+            raise ValueError(f"batch of {b} exceeds engine max_batch {self.max_batch}")
+        self._input[:b].copy_(sample.to(self.device, dtype=torch.float32))
+        self.context.set_input_shape(INPUT_NAME, tuple(self._input[:b].shape))
+        self.stream.wait_stream(torch.cuda.current_stream(self.device))
+        self.context.execute_async_v3(self.stream.cuda_stream)
+        torch.cuda.current_stream(self.device).wait_stream(self.stream)
+        return self._output[:b].clone()
+
+    __call__ = forward
+
+
+def load_or_build_engine(model, device, model_type, net_w, net_h, cache_dir, fp16=True, max_batch=16):
+    """Return a TRTDepthModel, building and caching the engine on first use."""
+    precision = "fp16" if fp16 else "fp32"
+    engine_path = engine_cache_path(cache_dir, model_type, net_w, net_h, precision, max_batch)
+    if not os.path.exists(engine_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        onnx_path = os.path.splitext(engine_path)[0] + ".onnx"
+        export_onnx(model, onnx_path, net_w, net_h, device)
+        build_trt_engine(onnx_path, engine_path, net_w, net_h, fp16=fp16, max_batch=max_batch)
+    return TRTDepthModel(engine_path, net_w, net_h, max_batch=max_batch, device=device)
@@ -1,82 +1,116 @@
 import math
 import time
-import torch
+import logging
 import threading
 from typing import Callable
-from tello_obstacle_detection.depth_pipeline.midas_trigger import capture_and_compute_depth, init_depth_model
-from tello_obstacle_detection.depth_pipeline.post_processor import safe_direction, normalize_midas_depth
-from tello_obstacle_detection.gird_map.grid_map_builder import build_grid_x_graph
+from tello_obstacle_detection.depth_pipeline.post_processor import safe_direction_from_depth
+from tello_obstacle_detection.gird_map.grid_map_builder import cached_grid_x_graph
 from tello_obstacle_detection.path_calculator.path_calculator import find_path, path_re_planner
 from djitellopy import Tello
 
+logger = logging.getLogger(__name__)
+
+# Serializes commands that expect a reply. djitellopy collects every reply in one shared
+# list and each command pops the oldest, so a command whose reply is never read (or one
+# sent from another thread mid-command) hands its "ok" to the next command instead.
+command_lock = threading.Lock()
+
+SETTLE_S = 0.5  # the airframe sways for about this long after a turn or forward move
+_last_motion_end = 0.0  # time.monotonic() when the last turn or move returned
+
+def _mark_motion():
+    global _last_motion_end
+    _last_motion_end = time.monotonic()
+
+def _settle():
+    """Sleep until SETTLE_S has passed since the last turn or move, so frames are not mid-sway."""
+    remaining = SETTLE_S - (time.monotonic() - _last_motion_end)
+    if remaining > 0:
+        time.sleep(remaining)
+
 class DroneKeepAlive:
     """Background thread to prevent Tello auto-landing"""
+    __slots__ = ("drone", "interval", "thread", "_stop")
+
     def __init__(self, drone, interval=10):
         self.drone = drone
         self.interval = interval
-        self.running = False
         self.thread = None
+        self._stop = threading.Event()
+    
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive() and not self._stop.is_set()
     
     def start(self):
-        self.running = True
+        # Threads cannot be restarted; only spawn a new one if the previous has exited
+        if self.thread and self.thread.is_alive():
+            return
+        self._stop.clear()
         self.thread = threading.Thread(target=self._keep_alive_loop, daemon=True)
         self.thread.start()
     
     def stop(self):
-        self.running = False
+        self._stop.set()  # wakes the loop immediately instead of after the interval
         if self.thread:
             self.thread.join(timeout=2)
     
     def _keep_alive_loop(self):
-        while self.running:
+        while not self._stop.is_set():
             try:
-                battery = self.drone.get_battery()
-                print(f"[KeepAlive] Battery: {battery}%")
-                time.sleep(self.interval)
+                # Resets the auto-land timer; reads its own reply so none is left for the flight loop
+                with command_lock:
+                    self.drone.send_control_command("command")
+                battery = self.drone.get_battery()  # read from the state stream, no round trip
+                logger.debug("[KeepAlive] Battery: %s%%", battery)
+                self._stop.wait(self.interval)
             except Exception as e:
-                print(f"[KeepAlive] Error: {e}")
-                time.sleep(1)
+                logger.warning("[KeepAlive] Error: %s", e)
+                self._stop.wait(1)
 
-def is_facing_target(heading, target, pos, tolerance_deg=10):
-    """Check if drone is facing toward the target within tolerance"""
+def _heading_turn(heading, target, pos):
+    """
+    Signed turn in (-180, 180] degrees that faces the drone toward target, or None if
+    already there. Positive is clockwise, negative counter-clockwise.
+    """
     dx = target[0] - pos[0]
     dy = target[1] - pos[1]
     if abs(dx) < 1e-6 and abs(dy) < 1e-6:
-        return True
+        return None
 
-    desired_angle = math.degrees(math.atan2(dx, dy)) % 360
-    delta = (desired_angle - heading + 360) % 360
-    if delta > 180:
-        delta = 360 - delta
-    return delta <= tolerance_deg
+    desired_angle = math.degrees(math.atan2(dx, dy))
+    return 180.0 - (heading - desired_angle + 540.0) % 360.0
+
+def is_facing_target(heading, target, pos, tolerance_deg=10):
+    """Check if drone is facing toward the target within tolerance"""
+    delta = _heading_turn(heading, target, pos)
+    return delta is None or abs(delta) <= tolerance_deg
 
 def rotate_toward(drone, target, pos, heading):
     """Rotate drone toward target direction"""
-    dx = target[0] - pos[0]
-    dy = target[1] - pos[1]
-    if abs(dx) < 1e-6 and abs(dy) < 1e-6:
+    delta = _heading_turn(heading, target, pos)
+    if delta is None:
         return heading
     
-    desired_angle = math.degrees(math.atan2(dx, dy)) % 360
-    turn = (desired_angle - heading + 360) % 360
-    
-    if turn > 180:
-        delta = 360 - turn
-        if delta > 5:  # Set minimum rotation angle
-            drone.rotate_counter_clockwise(int(delta))
-            heading = (heading - delta) % 360
-    else:
-        if turn > 5:  # Set minimum rotation angle
-            drone.rotate_clockwise(int(turn))
-            heading = (heading + turn) % 360
+    if abs(delta) <= 5:  # Set minimum rotation angle
+        return heading
+
+    with command_lock:
+        if delta > 0:
+            drone.rotate_clockwise(int(delta))
+        else:
+            drone.rotate_counter_clockwise(int(-delta))
     
-    return heading
+    return (heading + delta) % 360
 
 def safe_depth_capture(drone, depth_context, max_retries=3):
     """Safe depth capture with retry logic and keep-alive pings."""
+    # Imported here so loading the navigator does not pull in torch and MiDaS
+    from tello_obstacle_detection.depth_pipeline.midas_trigger import capture_and_compute_depth
+
     for attempt in range(max_retries):
         try:
-            print(f"[DepthCapture] Attempt {attempt + 1}/{max_retries}")
+            logger.debug("[DepthCapture] Attempt %d/%d", attempt + 1, max_retries)
             time.sleep(0.1)  # small delay before frame capture
             
             rgb_frame, depth = capture_and_compute_depth(
@@ -89,22 +123,23 @@ def safe_depth_capture(drone, depth_context, max_retries=3):
                 depth_context["net_h"],
                 depth_context["optimize"],
             )
-            print(f"[DepthCapture] Success - Depth shape: {depth.shape}")
+            logger.debug("[DepthCapture] Success - Depth shape: %s", depth.shape)
             return rgb_frame, depth
 
         except Exception as e:
-            print(f"[DepthCapture] Attempt {attempt + 1} failed: {e}")
+            logger.warning("[DepthCapture] Attempt %d failed: %s", attempt + 1, e)
 
             # Send keep-alive immediately after failure
             try:
-                drone.get_battery()
+                with command_lock:
+                    drone.send_control_command("command")
             except Exception as ka_err:
-                print(f"[DepthCapture] Keep-alive failed: {ka_err}")
+                logger.warning("[DepthCapture] Keep-alive failed: %s", ka_err)
 
             if attempt < max_retries - 1:
                 time.sleep(0.5)
             else:
-                print("[DepthCapture] All attempts failed")
+                logger.error("[DepthCapture] All attempts failed")
                 return None, None
 
 def move_toward_with_depth(drone, target, pos, path, heading, depth_context, depth_callback):
@@ -113,15 +148,18 @@ def move_toward_with_depth(drone, target, pos, path, heading, depth_context, dep
     dist = math.hypot(dx, dy)
 
     if dist < 0.1:  # Consider arrived if within 10cm
-        return pos, heading
+        return pos, heading, path, True
 
-    print(f"[Navigation] Moving to {target}, distance: {dist:.2f}m")
+    logger.info("[Navigation] Moving to %s, distance: %.2fm", target, dist)
 
     # 1. Rotate toward target
-    heading = rotate_toward(drone, target, pos, heading)
+    new_heading = rotate_toward(drone, target, pos, heading)
     
-    # 2. Wait for stabilization after rotation
-    time.sleep(0.5)
+    # 2. Wait for stabilization after this turn or the previous leg's move
+    if new_heading != heading:
+        _mark_motion()
+    heading = new_heading
+    _settle()
     
     # 3. Depth capture (before moving)
     rgb_frame, depth = safe_depth_capture(drone, depth_context)
@@ -130,20 +168,22 @@ def move_toward_with_depth(drone, target, pos, path, heading, depth_context, dep
 
     # 4. Print out the safe direction analysed
     if depth is not None:
-        depth_normalisation = normalize_midas_depth(depth)
-        direction = safe_direction(depth_normalisation, near_thresh=0.35, min_free=0.65)
-        print(f"[Obstacle Check] Safe direction: {direction}")
+        # MiDaS output is upsampled to the camera frame; 64x64 is plenty for three sectors
+        direction = safe_direction_from_depth(depth, near_thresh=0.35, min_free=0.65, size=(64, 64))
+        logger.info("[Obstacle Check] Safe direction: %s", direction)
     else:
-        print("[Obstacle Check] Depth is not captured")
+        logger.warning("[Obstacle Check] Depth is not captured")
 
     # 5. Adjust the path or proceed
     if direction == 'center':
         # Move (in cm units, max 500cm limit)
         move_cm = min(int(dist*100), 500)
         if move_cm <= 10:
-            return pos, heading
-        drone.move_forward(move_cm)
-        time.sleep(move_cm/50.0)
+            return pos, heading, path, True
+        # move_forward blocks until the Tello acknowledges the finished move
+        with command_lock:
+            drone.move_forward(move_cm)
+        _mark_motion()  # the next capture waits out the sway
 
         # Update new position
         new_position = (target[0], target[1])
@@ -173,15 +213,15 @@ def execute_simple_route(
             goal: Target (x,y) position in meters in the same local frame as the planner; start is assumed to be (0.0,0.0). 
             altitude: Desired flight altitude in meters; reserved for downstream motion logic if utilized. 
             depth_callback: Optional callable invoked by move_toward_with_depth for depth outputs or telemetry; may be None. Returns: None. 
-            Behavior: Builds a grid graph with build_grid_x_graph, computes a path with find_path, and iteratively calls move_toward_with_depth to advance toward each waypoint; 
+            Behavior: Builds (or reuses) a grid graph with cached_grid_x_graph, computes a path with find_path, and iteratively calls move_toward_with_depth to advance toward each waypoint; 
             
     logs progress and continues past per-waypoint errors. Raises: Propagates exceptions thrown before the waypoint loop (e.g., planning failures); per-waypoint exceptions are caught, logged, and the loop continues.
     
     """
 
-    G, nodes = build_grid_x_graph(width, length, spacing)
+    G, nodes = cached_grid_x_graph(width, length, spacing)
     path = find_path(G, nodes, start, goal)
-    print(f"Planned waypoints: {path}")
+    logger.info("Planned waypoints: %s", path)
 
     position = start
     heading = 0.0
@@ -190,7 +230,7 @@ def execute_simple_route(
     # Loop until all waypoints completed
     while i < len(path):
         target = path[i]
-        print(f"\n[Route] Waypoint {i+1}/{len(path)}: {target}")
+        logger.info("[Route] Waypoint %d/%d: %s", i + 1, len(path), target)
         try:
             position, heading, path, proceed = move_toward_with_depth(
                 drone, target, position, path, heading, depth_context, depth_callback
@@ -203,6 +243,6 @@ def execute_simple_route(
                 path = path
 
         except Exception as e:
-            print(f"[Route] Error at waypoint {target}: {e}")
+            logger.error("[Route] Error at waypoint %s: %s", target, e)
 
-    print("\n[Route] All waypoints completed!")
+    logger.info("[Route] All waypoints completed!")
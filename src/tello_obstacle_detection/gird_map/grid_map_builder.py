@@ -1,4 +1,6 @@
 import math
+import functools
+import numpy as np
 import networkx as nx
 
 def build_grid_x_graph(width, length, spacing=0.5):
@@ -13,7 +15,12 @@ def build_grid_x_graph(width, length, spacing=0.5):
         spacing (float): distance between adjacent grid nodes in meters.
 
     Returns:
-        G (networkx.Graph): graph; each node has attribute 'coord' = (x, y).
+        G (networkx.Graph): graph; each node has attribute 'coord' = (x, y) and
+            G.graph['coords'] holds all coordinates as an (N, 2) array indexed by node id,
+            and G.graph['corner_id'] / G.graph['center_id'] map integer grid indices (i, j)
+            to node ids, so callers can look nodes up without hashing float coordinates.
+            find_path keeps its neighbour lists and routes for this graph in G.graph, so
+            the graph must not be edited once it has been planned on.
         nodes (dict): mapping from (x, y) to node index in G.
     """
     if spacing <= 0:
@@ -27,56 +34,62 @@ def build_grid_x_graph(width, length, spacing=0.5):
         raise ValueError("width and length must each be at least spacing")
 
     actual_width = Nx * spacing
-    actual_length = Ny * spacing
     dx = spacing
     dy = spacing
 
-    nodes = {}
-    idx = 0
-    # 1. Grid corners
-    for i in range(Nx + 1):
-        x = -actual_width / 2 + i * dx
-        for j in range(Ny + 1):
-            y = j * dy
-            nodes[(x, y)] = idx
-            idx += 1
+    # 1. Node coordinates as arrays: corners (i-major), then cell centers (where diagonals cross)
+    n_corners = (Nx + 1) * (Ny + 1)
+    CI, CJ = np.meshgrid(np.arange(Nx + 1), np.arange(Ny + 1), indexing="ij")
+    MI, MJ = np.meshgrid(np.arange(Nx), np.arange(Ny), indexing="ij")
+    coords = np.empty((n_corners + Nx * Ny, 2))
+    corners, centers = coords[:n_corners], coords[n_corners:]
+    np.multiply(CI.ravel(), dx, out=corners[:, 0])
+    np.multiply(CJ.ravel(), dy, out=corners[:, 1])
+    np.multiply(MI.ravel() + 0.5, dx, out=centers[:, 0])
+    np.multiply(MJ.ravel() + 0.5, dy, out=centers[:, 1])
+    coords[:, 0] += -actual_width / 2
 
-    # 2. Cell centers (where diagonals cross)
-    for i in range(Nx):
-        cx = -actual_width / 2 + (i + 0.5) * dx
-        for j in range(Ny):
-            cy = (j + 0.5) * dy
-            nodes[(cx, cy)] = idx
-            idx += 1
+    # Node ids by index arithmetic: corner (i, j) -> i*(Ny+1) + j, center (i, j) -> n_corners + i*Ny + j
+    corner_id = np.arange(n_corners).reshape(Nx + 1, Ny + 1)
+    center_id = n_corners + np.arange(Nx * Ny).reshape(Nx, Ny)
 
-    # 3. Build graph and connect each center to its four corners
-    G = nx.Graph()
-    for coord, node_id in nodes.items():
-        G.add_node(node_id, coord=coord)
+    # 2. Each center to its four corners: (x0,y0), (x1,y0), (x1,y1), (x0,y1)
+    diag_src = np.repeat(center_id.ravel(), 4)
+    diag_dst = np.stack([
+        corner_id[:-1, :-1], corner_id[1:, :-1], corner_id[1:, 1:], corner_id[:-1, 1:]
+    ], axis=-1).ravel()
 
-    for i in range(Nx):
-        x0 = -actual_width / 2 + i * dx
-        x1 = x0 + dx
-        for j in range(Ny):
-            y0 = j * dy
-            y1 = y0 + dy
-            center = (-actual_width / 2 + (i + 0.5) * dx, (j + 0.5) * dy)
-            c_idx = nodes[center]
-            for corner in [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]:
-                corner_idx = nodes[corner]
-                dist = math.hypot(corner[0] - center[0], corner[1] - center[1])
-                G.add_edge(c_idx, corner_idx, weight=dist)
+    # 3. Corner to corner east and north, emitted per corner in the same order as the corners
+    east = np.full((Nx + 1, Ny + 1), -1)
+    north = np.full((Nx + 1, Ny + 1), -1)
+    east[:-1, :] = corner_id[1:, :]
+    north[:, :-1] = corner_id[:, 1:]
+    axial_src = np.repeat(corner_id.ravel(), 2)
+    axial_dst = np.stack([east, north], axis=-1).ravel()
+    valid = axial_dst >= 0
+    axial_src, axial_dst = axial_src[valid], axial_dst[valid]
 
-    # 4. Connect corner-to-corner horizontally and vertically
-    for coord, nid in list(nodes.items()):
-        x, y = coord
-        # only if this is a corner (multiples of spacing)
-        if abs((x + actual_width/2) % spacing) < 1e-6 and abs(y % spacing) < 1e-6:
-            # neighbor offsets east and north
-            for dx_off, dy_off in [(spacing, 0), (0, spacing)]:
-                nbr = (x + dx_off, y + dy_off)
-                if nbr in nodes:
-                    nid2 = nodes[nbr]
-                    G.add_edge(nid, nid2, weight=math.hypot(dx_off, dy_off))
-                    
-    return G, nodes
\ No newline at end of file
+    # Every diagonal is half a cell diagonal and every axial edge one spacing long
+    diag = math.hypot(dx / 2, dy / 2)
+    src = np.concatenate([diag_src, axial_src])
+    dst = np.concatenate([diag_dst, axial_dst])
+    weights = np.concatenate([np.full(diag_src.size, diag), np.full(axial_src.size, float(spacing))])
+
+    # 4. Build graph in bulk; each node has attribute 'coord' = (x, y)
+    coord_list = [tuple(c) for c in coords.tolist()]
+    nodes = {coord: idx for idx, coord in enumerate(coord_list)}
+    G = nx.Graph(coords=coords, corner_id=corner_id, center_id=center_id)
+    G.add_nodes_from((idx, {"coord": coord}) for idx, coord in enumerate(coord_list))
+    G.add_weighted_edges_from(zip(src.tolist(), dst.tolist(), weights.tolist()))
+
+    return G, nodes
+
+@functools.lru_cache(maxsize=8)
+def cached_grid_x_graph(width, length, spacing=0.5):
+    """
+    build_grid_x_graph memoized on (width, length, spacing), so repeated route
+    planning over the same arena reuses one graph. The returned graph and nodes
+    dict are shared between callers: do not add or remove nodes or edges, or change
+    weights. find_path's own caches in G.graph are the only state written to it.
+    """
+    return build_grid_x_graph(width, length, spacing)
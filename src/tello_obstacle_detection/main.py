@@ -1,9 +1,48 @@
+import os
 import time
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+# Must be set before torch initializes CUDA; curbs fragmentation over long missions
+os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
 import torch
 from djitellopy import Tello
 from tello_obstacle_detection.depth_pipeline.midas_trigger import init_depth_model
-from drone_navigator.drone_navigator import execute_simple_route
-from tello_obstacle_detection.drone_navigator.drone_navigator import DroneKeepAlive
+from tello_obstacle_detection.drone_navigator.drone_navigator import execute_simple_route, DroneKeepAlive, command_lock
+
+logger = logging.getLogger(__name__)
+
+# Loaded once per process, so a restarted mission reuses the warm (compiled) model
+_depth_ctx = None
+
+
+def setup_logging():
+    """
+    Send log records through a queue drained by a background listener, so the
+    flight loop and keep-alive thread never block on console I/O. DEBUG=True in
+    .env enables debug-level output.
+    """
+    level = logging.DEBUG if os.getenv("DEBUG", "").lower() == "true" else logging.INFO
+    log_queue = queue.SimpleQueue()
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    listener = QueueListener(log_queue, console)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+    listener.start()
+    return listener
+
+
+def teardown_logging(listener):
+    """Stop the listener and detach its QueueHandler, so a later setup_logging starts clean."""
+    listener.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler) and handler.queue is listener.queue:
+            root.removeHandler(handler)
 
 
 def make_depth_context():
@@ -14,7 +53,11 @@ def make_depth_context():
         "src/tello_obstacle_detection/weights/dpt_swin2_tiny_256.pt",
         model_type="dpt_swin2_tiny_256",
         optimize=False,
+        trt_cache_dir="src/tello_obstacle_detection/weights/trt",
     )
+    if device.type == "cuda":
+        # Hand the warm-up and compile scratch memory back before flight
+        torch.cuda.empty_cache()
     return {
         "device": device,
         "model": model,
@@ -26,6 +69,14 @@ def make_depth_context():
     }
 
 
+def get_depth_context():
+    """Return the process-wide depth_context, creating it on first use."""
+    global _depth_ctx
+    if _depth_ctx is None:
+        _depth_ctx = make_depth_context()
+    return _depth_ctx
+
+
 def main():
     WIDTH = 3.0
     LENGTH = 5.0
@@ -33,6 +84,7 @@ def main():
     START = (0.0, 0.0)
     GOAL = (0.0, 4.0)
     ALTITUDE = 1.0
+    listener = setup_logging()
     drone = Tello()
     ka = None
     try:
@@ -41,7 +93,7 @@ def main():
         time.sleep(2)
 
         # Load the depth model before taking off
-        depth_ctx = make_depth_context()
+        depth_ctx = get_depth_context()
 
         # Take off and immediately start the keep-alive thread
         drone.takeoff()
@@ -67,11 +119,13 @@ def main():
         if ka:
             ka.stop()
         try:
-            drone.land()
+            with command_lock:  # a keep-alive ping may still be waiting on its reply
+                drone.land()
             time.sleep(3)
             drone.streamoff()
         except Exception as e:
-            print(f"[Cleanup] {e}")
+            logger.error("[Cleanup] %s", e)
+        teardown_logging(listener)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,11 @@
 import math
+import logging
+from heapq import heappush, heappop
+from itertools import count
 import networkx as nx
+import numpy as np
+
+logger = logging.getLogger(__name__)
 
 def find_path(G, nodes, start, goal):
     """
@@ -14,31 +20,133 @@ def find_path(G, nodes, start, goal):
     Returns:
         List[tuple]: ordered list of (x, y) waypoints from start to goal.
     """
+    if 'corner_id' not in G.graph:
+        return _find_path_any(G, nodes, start, goal)
+
+    # Grid from build_grid_x_graph: node ids are the row indices of G.graph['coords']
+    coords = G.graph['coords']
+
+    # Snap to graph nodes
+    start_idx = _nearest(G, coords, start)
+    goal_idx  = _nearest(G, coords, goal)
+
+    # Grids are never edited after construction, so a (start, goal) pair always yields the same route
+    plans = G.graph.setdefault('plans', {})
+    path = plans.get((start_idx, goal_idx))
+    if path is None:
+        # A* search; straight-line distance to the goal for every node in one pass
+        gx, gy = coords[goal_idx]
+        h = np.hypot(coords[:, 0] - gx, coords[:, 1] - gy).tolist()
+        adj = G.graph.get('adjacency')
+        if adj is None:
+            adj = G.graph['adjacency'] = _adjacency(G)
+        path_idxs = _astar(adj, start_idx, goal_idx, heuristic=h.__getitem__)
+
+        # Map back to coordinates
+        path = [G.nodes[i]['coord'] for i in path_idxs]
+        plans[(start_idx, goal_idx)] = path
+    return list(path)
+
+def _find_path_any(G, nodes, start, goal):
+    """
+    find_path for graphs not built by build_grid_x_graph. Their node ids can be anything
+    and the caller may edit them between calls, so nothing is cached on them.
+    """
     def euclidean(a, b):
         return math.hypot(a[0]-b[0], a[1]-b[1])
 
     # Snap to graph nodes
-    start_idx = min(nodes.values(),
-                    key=lambda i: euclidean(G.nodes[i]['coord'], start))
-    goal_idx  = min(nodes.values(),
-                    key=lambda i: euclidean(G.nodes[i]['coord'], goal))
-
-    # A* search
-    path_idxs = nx.astar_path(
-        G,
+    start_idx = min(nodes.values(), key=lambda i: euclidean(G.nodes[i]['coord'], start))
+    goal_idx  = min(nodes.values(), key=lambda i: euclidean(G.nodes[i]['coord'], goal))
+
+    goal_coord = G.nodes[goal_idx]['coord']
+    path_idxs = _astar(
+        _adjacency(G),
         start_idx,
         goal_idx,
-        heuristic=lambda u, v: euclidean(G.nodes[u]['coord'], G.nodes[v]['coord']),
-        weight='weight'
+        heuristic=lambda u: euclidean(G.nodes[u]['coord'], goal_coord),
     )
-
-    # Map back to coordinates
     return [G.nodes[i]['coord'] for i in path_idxs]
 
+def _nearest(G, coords, point):
+    """
+    Id of the grid node closest to point; ties go to the lowest id, like min() over nodes.
+    Only the corners and centers of the cell around point are compared.
+    """
+    corner_id = G.graph['corner_id']
+    center_id = G.graph['center_id']
+    x0, y0 = coords[0]
+    spacing = coords[corner_id[1, 0], 0] - x0
+    fx = (point[0] - x0) / spacing
+    fy = (point[1] - y0) / spacing
+
+    # The nearest lattice point is the floor or ceil index along each axis, clamped to the grid
+    def around(f, hi):
+        i = math.floor(f)
+        return [min(max(i, 0), hi), min(max(i + 1, 0), hi)]
+
+    nx_c, ny_c = corner_id.shape
+    candidates = np.unique(np.concatenate([
+        corner_id[np.ix_(around(fx, nx_c - 1), around(fy, ny_c - 1))].ravel(),
+        center_id[np.ix_(around(fx - 0.5, nx_c - 2), around(fy - 0.5, ny_c - 2))].ravel(),
+    ]))
+    # math.hypot, not np.hypot: the two can round differently, which would break exact ties
+    px, py = point
+    return min(candidates.tolist(), key=lambda i: math.hypot(coords[i, 0] - px, coords[i, 1] - py))
+
+def _adjacency(G):
+    """Neighbour lists {u: [(v, weight), ...]} in G's adjacency order."""
+    return {u: [(v, d.get('weight', 1)) for v, d in nbrs.items()] for u, nbrs in G.adj.items()}
+
+def _astar(adj, source, target, heuristic):
+    """
+    A* over precomputed neighbour lists. Mirrors networkx.astar_path, including its
+    tie-breaking, but skips the per-edge weight callback and attribute-dict lookups.
+    """
+    c = count()
+    queue = [(0, next(c), source, 0, None)]
+    enqueued = {}  # node -> (cost to reach, heuristic)
+    explored = {}  # node -> parent
+    while queue:
+        _, __, curnode, dist, parent = heappop(queue)
+
+        if curnode == target:
+            path = [curnode]
+            node = parent
+            while node is not None:
+                path.append(node)
+                node = explored[node]
+            path.reverse()
+            return path
+
+        if curnode in explored:
+            # Never override the start node's parent; skip stale queue entries
+            if explored[curnode] is None:
+                continue
+            qcost, h = enqueued[curnode]
+            if qcost < dist:
+                continue
+
+        explored[curnode] = parent
+
+        for neighbor, cost in adj[curnode]:
+            ncost = dist + cost
+            if neighbor in enqueued:
+                qcost, h = enqueued[neighbor]
+                if qcost <= ncost:
+                    continue
+            else:
+                h = heuristic(neighbor)
+            enqueued[neighbor] = ncost, h
+            heappush(queue, (ncost + h, next(c), neighbor, ncost, curnode))
+
+    raise nx.NetworkXNoPath(f"Node {target} not reachable from {source}")
+
 def path_re_planner(direction: str, path: list[tuple[float, float]], position: tuple, shift: float = 0.5) -> list[tuple[float, float]]:
     """Adjust the nodes according to the safe direction detected."""
     if not path:
-        print("[Route] No Path to re-plan.")
+        logger.debug("[Route] No Path to re-plan.")
+        return path
 
     goal = path[-1]
 
@@ -0,0 +1,25 @@
+import pytest
+from tello_obstacle_detection.gird_map.grid_map_builder import build_grid_x_graph
+
+
+@pytest.fixture(scope="session")
+def grid_cache():
+    """(width, length, spacing) -> (G, nodes), shared by every test in the session."""
+    return {}
+
+
+@pytest.fixture
+def cached_grid(grid_cache):
+    """
+    Build (or reuse) a grid graph for this session. find_path's route and neighbour
+    caches are dropped before each hand-out, so every test runs its own search.
+    """
+    def get(width, length, spacing):
+        key = (width, length, spacing)
+        if key not in grid_cache:
+            grid_cache[key] = build_grid_x_graph(width, length, spacing)
+        G, nodes = grid_cache[key]
+        G.graph.pop('plans', None)
+        G.graph.pop('adjacency', None)
+        return G, nodes
+    return get
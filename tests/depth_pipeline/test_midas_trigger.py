@@ -181,3 +181,31 @@ def test_capture_and_compute_depth_integration(monkeypatch, fake_model_and_trans
     h, w = dummy_rgb_image.shape[0], dummy_rgb_image.shape[1]
     assert depth_map.shape == (h, w)
     assert np.allclose(depth_map, 2.5)
+
+def test_capture_and_compute_depth_frame_is_drawable(monkeypatch, fake_model_and_transform, fake_process, dummy_rgb_image):
+    import cv2
+
+    class FakeFrameRead:
+        def __init__(self, frame):
+            self.frame = frame
+
+    class FakeTello:
+        def __init__(self, rgb):
+            self._fr = FakeFrameRead(cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))
+
+        def get_frame_read(self):
+            return self._fr
+
+    device = torch.device("cpu")
+    model, transform, net_w, net_h = dt.init_depth_model(device, "unused", "type", optimize=False)
+    tello = FakeTello(dummy_rgb_image)
+
+    rgb_frame, _ = dt.capture_and_compute_depth(
+        tello, device, model, "type", transform, net_w, net_h, optimize=False
+    )
+    # The callback frame owns its memory and accepts OpenCV drawing calls
+    assert rgb_frame.flags["C_CONTIGUOUS"]
+    assert not np.shares_memory(rgb_frame, tello._fr.frame)
+    assert np.array_equal(rgb_frame, dummy_rgb_image)
+    cv2.rectangle(rgb_frame, (1, 1), (10, 10), (255, 0, 0), 1)
+    cv2.putText(rgb_frame, "ok", (2, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 0), 1)
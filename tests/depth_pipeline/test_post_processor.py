@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from tello_obstacle_detection.depth_pipeline.post_processor import (
+    normalize_midas_depth,
+    safe_direction,
+    safe_direction_from_depth,
+    downsample_depth,
+)
+
+
+def test_normalize_midas_depth_range():
+    depth = np.linspace(2.0, 10.0, 64, dtype=np.float32).reshape(8, 8)
+    norm = normalize_midas_depth(depth)
+    assert norm.dtype == np.float32
+    assert norm.shape == depth.shape
+    assert norm.min() == pytest.approx(0.0)
+    assert norm.max() == pytest.approx(1.0)
+    assert np.allclose(norm, (depth - 2.0) / 8.0, atol=1e-6)
+
+
+def test_normalize_midas_depth_uniform_returns_zeros():
+    depth = np.full((4, 4), 3.0, dtype=np.float32)
+    assert np.array_equal(normalize_midas_depth(depth), np.zeros_like(depth))
+
+
+def make_depth(blocked_sectors, h=30, w=30):
+    """Normalized depth map where the named sectors are fully blocked (close obstacles)."""
+    depth = np.zeros((h, w), dtype=np.float32)
+    bounds = {"left": (0, w // 3), "center": (w // 3, 2 * w // 3), "right": (2 * w // 3, w)}
+    for name in blocked_sectors:
+        x0, x1 = bounds[name]
+        depth[:, x0:x1] = 1.0
+    return depth
+
+
+@pytest.mark.parametrize("blocked,expected", [
+    ([], "center"),
+    (["left", "right"], "center"),
+    (["center"], "right"),
+    (["center", "right"], "left"),
+    (["left", "center", "right"], "none"),
+])
+def test_safe_direction_priority(blocked, expected):
+    assert safe_direction(make_depth(blocked)) == expected
+
+
+def test_safe_direction_ignores_outside_band():
+    depth = np.zeros((30, 30), dtype=np.float32)
+    depth[:10, :] = 1.0   # above the central band
+    depth[20:, :] = 1.0   # below the central band
+    assert safe_direction(depth) == "center"
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_safe_direction_from_depth_matches_normalized(seed):
+    rng = np.random.default_rng(seed)
+    depth = rng.uniform(100.0, 900.0, size=(48, 64)).astype(np.float32)
+    depth[:, 20:44] *= rng.uniform(0.5, 2.0)  # make the center differ from the sides
+    for near_thresh in (0.2, 0.35, 0.6):
+        expected = safe_direction(normalize_midas_depth(depth), near_thresh=near_thresh, min_free=0.5)
+        assert safe_direction_from_depth(depth, near_thresh=near_thresh, min_free=0.5) == expected
+
+
+def test_safe_direction_from_depth_uniform_is_clear():
+    assert safe_direction_from_depth(np.full((30, 30), 5.0, dtype=np.float32)) == "center"
+
+
+def test_downsample_depth_quantizes_to_uint8():
+    depth = np.linspace(0.0, 50.0, 720 * 960, dtype=np.float32).reshape(720, 960)
+    small = downsample_depth(depth, (64, 48))
+    assert small.dtype == np.uint8
+    assert small.shape == (48, 64)
+    assert small.min() == 0 and small.max() == 255
+
+
+@pytest.mark.parametrize("blocked,expected", [
+    ([], "center"),
+    (["center"], "right"),
+    (["center", "right"], "left"),
+    (["left", "center", "right"], "none"),
+])
+def test_safe_direction_from_downsampled_depth(blocked, expected):
+    depth = make_depth(blocked, h=720, w=960) * 40.0 + 10.0
+    # Pin the range with far/near strips outside the central band
+    depth[:40, :] = 0.0
+    depth[-40:, :] = 50.0
+    assert safe_direction_from_depth(depth, size=(64, 64)) == expected
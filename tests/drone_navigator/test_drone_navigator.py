@@ -1,24 +1,42 @@
 """
-Unit tests for drone_navigator module verifying move_toward behavior
+Unit tests for drone_navigator module verifying rotate_toward and move_toward_with_depth behavior
 """
 
 import math
+import time
+import numpy as np
 import pytest
-from tello_obstacle_detection.drone_navigator.drone_navigator import move_toward
+import tello_obstacle_detection.drone_navigator.drone_navigator as dn
+from tello_obstacle_detection.drone_navigator.drone_navigator import (
+    is_facing_target,
+    move_toward_with_depth,
+    rotate_toward,
+)
 
 
 class MockDrone:
+    """Records commands as parallel kind/value lists; `actions` zips them for assertions."""
+    __slots__ = ('kinds', 'values')
+
     def __init__(self):
-        self.actions = []
+        self.kinds = []
+        self.values = []
+
+    @property
+    def actions(self):
+        return list(zip(self.kinds, self.values))
 
     def rotate_clockwise(self, angle_cm):
-        self.actions.append(('cw', angle_cm))
+        self.kinds.append('cw')
+        self.values.append(angle_cm)
 
     def rotate_counter_clockwise(self, angle_cm):
-        self.actions.append(('ccw', angle_cm))
+        self.kinds.append('ccw')
+        self.values.append(angle_cm)
 
     def move_forward(self, distance_cm):
-        self.actions.append(('fwd', distance_cm))
+        self.kinds.append('fwd')
+        self.values.append(distance_cm)
 
 
 @pytest.fixture
@@ -27,56 +45,238 @@ def drone():
     return MockDrone()
 
 
+@pytest.fixture
+def clear_ahead(monkeypatch):
+    """Depth capture that always reports a clear center, with the flight settles skipped"""
+    # Uniform depth normalizes to all-far, so every sector is free
+    monkeypatch.setattr(dn, "safe_depth_capture", lambda drone, ctx: (None, np.ones((48, 64), dtype=np.float32)))
+    monkeypatch.setattr(dn.time, "sleep", lambda s: None)
+
+
+def test_mock_drone_records_in_call_order(drone):
+    """The parallel kind/value lists stay aligned and actions zips them back into pairs"""
+    drone.rotate_clockwise(30)
+    drone.move_forward(50)
+    drone.rotate_counter_clockwise(15)
+    assert drone.kinds == ['cw', 'fwd', 'ccw']
+    assert drone.values == [30, 50, 15]
+    assert drone.actions == [('cw', 30), ('fwd', 50), ('ccw', 15)]
+    with pytest.raises(AttributeError):
+        drone.extra = 1  # __slots__: no per-instance __dict__
+
+
 def test_no_movement_when_at_target(drone):
     """If the drone is already at the waypoint, it should not rotate or move"""
     start_pos = (1.0, 2.0)
     heading = 45.0
-    end_pos, end_heading = move_toward(drone, target=start_pos, pos=start_pos, heading=heading)
+    path = [start_pos]
+    end_pos, end_heading, end_path, moved = move_toward_with_depth(drone, start_pos, start_pos, path, heading, None, None)
     assert end_pos == start_pos
     assert end_heading == heading
+    assert end_path == path
+    assert moved is True  # arrived, so the route advances to the next waypoint
+    assert drone.actions == []
+
+
+def test_no_movement_for_short_hop(drone, clear_ahead):
+    """A hop of 10cm or less is treated as arrived and returns the full route tuple"""
+    start_pos = (0.0, 0.0)
+    target = (0.0, 0.105)
+    path = [start_pos, target]
+    end_pos, end_heading, end_path, moved = move_toward_with_depth(drone, target, start_pos, path, 0.0, {}, None)
+    assert end_pos == start_pos
+    assert end_heading == 0.0
+    assert end_path == path
+    assert moved is True
     assert drone.actions == []
 
 
-def test_move_forward_on_y_axis(drone):
-    """Target directly ahead on +Y should result in zero turn and forward movement"""
+def test_move_forward_on_y_axis(drone, clear_ahead):
+    """Target directly ahead on +Y should result in no turn and a forward movement"""
     start_pos = (0.0, 0.0)
     heading = 0.0  # facing +Y
     target = (0.0, 1.0)
-    new_pos, new_heading = move_toward(drone, target, start_pos, heading)
+    new_pos, new_heading, _, moved = move_toward_with_depth(drone, target, start_pos, [start_pos, target], heading, {}, None)
     # Expect no rotation and a 100cm forward move
-    assert drone.actions[0] == ('cw', 0)
-    assert drone.actions[1] == ('fwd', 100)
+    assert drone.actions == [('fwd', 100)]
+    assert moved
     assert pytest.approx(new_pos[0], abs=1e-6) == 0.0
     assert pytest.approx(new_pos[1], abs=1e-6) == 1.0
     assert new_heading == 0.0
 
 
-def test_turn_and_move_right(drone):
+def test_turn_and_move_right(drone, clear_ahead):
     """Target on +X should rotate +90° then move forward"""
     start_pos = (0.0, 0.0)
     heading = 0.0  # facing +Y
     target = (1.0, 0.0)
-    new_pos, new_heading = move_toward(drone, target, start_pos, heading)
-    # First action should be a 90° clockwise turn
-    assert ('cw', 90) in drone.actions
-    # Then a 100cm forward move
-    assert ('fwd', 100) in drone.actions
+    new_pos, new_heading, _, _ = move_toward_with_depth(drone, target, start_pos, [start_pos, target], heading, {}, None)
+    # First action should be a 90° clockwise turn, then a 100cm forward move
+    assert drone.actions == [('cw', 90), ('fwd', 100)]
+    assert drone.kinds == ['cw', 'fwd'] and drone.values == [90, 100]
     assert pytest.approx(new_pos[0], abs=1e-6) == 1.0
     assert pytest.approx(new_pos[1], abs=1e-6) == 0.0
     assert new_heading == 90.0
 
 
-def test_turn_and_move_left(drone):
+def test_turn_and_move_left(drone, clear_ahead):
     """Target on -X should rotate counter‑clockwise 90° then move forward"""
     start_pos = (0.0, 0.0)
     heading = 0.0  # facing +Y
     target = (-1.0, 0.0)
-    new_pos, new_heading = move_toward(drone, target, start_pos, heading)
-    # First action should be a 90° counter‑clockwise turn
-    assert ('ccw', 90) in drone.actions
-    # Then a 100cm forward move
-    assert ('fwd', 100) in drone.actions
+    new_pos, new_heading, _, _ = move_toward_with_depth(drone, target, start_pos, [start_pos, target], heading, {}, None)
+    # First action should be a 90° counter‑clockwise turn, then a 100cm forward move
+    assert drone.actions == [('ccw', 90), ('fwd', 100)]
     assert pytest.approx(new_pos[0], abs=1e-6) == -1.0
     assert pytest.approx(new_pos[1], abs=1e-6) == 0.0
     # Heading should wrap to 270°
     assert new_heading == 270.0
+
+
+@pytest.mark.parametrize("heading,target,expected_action,expected_heading", [
+    (350.0, (1.0, 1.0), ('cw', 55), 45.0),     # clockwise across north
+    (10.0, (-1.0, 1.0), ('ccw', 55), 315.0),   # counter-clockwise across north
+    (90.0, (0.0, -1.0), ('cw', 90), 180.0),
+    (270.0, (0.0, -1.0), ('ccw', 90), 180.0),
+    (0.0, (0.0, -1.0), ('cw', 180), 180.0),    # exact reversal turns clockwise
+    (180.0, (0.0, 1.0), ('cw', 180), 0.0),
+])
+def test_rotate_toward_sign_and_wrap(drone, heading, target, expected_action, expected_heading):
+    """Turns take the short way round, wrap through 0°/360°, and break a 180° tie clockwise"""
+    new_heading = rotate_toward(drone, target, (0.0, 0.0), heading)
+    assert drone.actions == [expected_action]
+    assert new_heading == pytest.approx(expected_heading, abs=1e-9)
+
+
+def test_rotate_toward_skips_small_turns(drone):
+    """Turns of 5° or less are not worth a command; the heading is left as is"""
+    assert rotate_toward(drone, (math.sin(math.radians(4)), 1.0), (0.0, 0.0), 0.0) == 0.0
+    assert rotate_toward(drone, (0.0, 1.0), (0.0, 0.0), 356.0) == 356.0
+    assert rotate_toward(drone, (0.0, 0.0), (0.0, 0.0), 123.0) == 123.0
+    assert drone.actions == []
+
+
+def _reference_turn(heading, target, pos):
+    """The original two-branch turn logic: (command, angle, new heading) or None."""
+    dx = target[0] - pos[0]
+    dy = target[1] - pos[1]
+    if abs(dx) < 1e-6 and abs(dy) < 1e-6:
+        return None
+    desired_angle = math.degrees(math.atan2(dx, dy)) % 360
+    turn = (desired_angle - heading + 360) % 360
+    if turn > 180:
+        delta = 360 - turn
+        if delta > 5:
+            return 'ccw', int(delta), (heading - delta) % 360
+    elif turn > 5:
+        return 'cw', int(turn), (heading + turn) % 360
+    return None
+
+
+def _reference_facing(heading, target, pos, tolerance_deg=10):
+    dx = target[0] - pos[0]
+    dy = target[1] - pos[1]
+    if abs(dx) < 1e-6 and abs(dy) < 1e-6:
+        return True
+    desired_angle = math.degrees(math.atan2(dx, dy)) % 360
+    delta = (desired_angle - heading + 360) % 360
+    if delta > 180:
+        delta = 360 - delta
+    return delta <= tolerance_deg
+
+
+def test_turn_logic_matches_original_on_heading_grid():
+    """rotate_toward and is_facing_target agree with the original logic on a 720 x 49 grid"""
+    targets = [(x, y) for x in range(-3, 4) for y in range(-3, 4)]  # includes the origin itself
+    for step in range(720):
+        heading = step * 0.5
+        for target in targets:
+            drone = MockDrone()
+            new_heading = rotate_toward(drone, target, (0.0, 0.0), heading)
+            expected = _reference_turn(heading, target, (0.0, 0.0))
+            if expected is None:
+                assert drone.actions == [] and new_heading == heading
+            else:
+                kind, angle, expected_heading = expected
+                assert drone.actions == [(kind, angle)]
+                assert math.isclose(new_heading, expected_heading, abs_tol=1e-9) or \
+                    math.isclose(abs(new_heading - expected_heading), 360.0, abs_tol=1e-9)
+            assert is_facing_target(heading, target, (0.0, 0.0)) == _reference_facing(heading, target, (0.0, 0.0))
+
+
+class ReplyQueueDrone:
+    """Mimics djitellopy's reply handling: every reply lands in one shared list and is popped oldest-first."""
+    def __init__(self):
+        self.responses = []
+        self.sent = []
+
+    def _send(self, command):
+        self.sent.append(command)
+        self.responses.append(f"ok {command}")
+
+    def send_command_without_return(self, command):
+        self._send(command)
+
+    def send_command_with_return(self, command):
+        self._send(command)
+        return self.responses.pop(0)
+
+    def send_control_command(self, command):
+        return self.send_command_with_return(command).startswith("ok")
+
+    def get_battery(self):
+        return 80
+
+    def move_forward(self, distance_cm):
+        return self.send_command_with_return(f"forward {distance_cm}")
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_keep_alive_ping_consumes_its_own_reply():
+    """After a keep-alive ping the next flight command reads its own reply, not the ping's"""
+    drone = ReplyQueueDrone()
+    ka = dn.DroneKeepAlive(drone, interval=60)
+    ka.start()
+    assert _wait_for(lambda: drone.sent == ["command"])
+    ka.stop()
+
+    assert drone.move_forward(50) == "ok forward 50"
+    assert drone.responses == []
+
+
+def test_keep_alive_waits_for_in_flight_command():
+    """The ping is held back while a flight command owns the command lock"""
+    drone = ReplyQueueDrone()
+    ka = dn.DroneKeepAlive(drone, interval=60)
+    with dn.command_lock:
+        ka.start()
+        time.sleep(0.2)
+        assert drone.sent == []
+    assert _wait_for(lambda: drone.sent == ["command"])
+    ka.stop()
+
+
+def test_capture_after_straight_move_waits_for_settle(drone, monkeypatch):
+    """A straight leg right after a forward move still settles before the depth frame is taken"""
+    events = []
+    monkeypatch.setattr(dn.time, "sleep", lambda s: events.append(('sleep', s)))
+
+    def capture(drone_, ctx):
+        events.append(('capture', None))
+        return None, np.ones((48, 64), dtype=np.float32)
+
+    monkeypatch.setattr(dn, "safe_depth_capture", capture)
+    path = [(0.0, 0.0), (0.0, 1.0), (0.0, 2.0)]
+    pos, heading, _, _ = move_toward_with_depth(drone, (0.0, 1.0), (0.0, 0.0), path, 0.0, {}, None)
+    events.clear()
+    move_toward_with_depth(drone, (0.0, 2.0), pos, path, heading, {}, None)
+
+    assert drone.actions == [('fwd', 100), ('fwd', 100)]
+    assert events[-1] == ('capture', None)
+    assert sum(s for kind, s in events if kind == 'sleep') >= dn.SETTLE_S - 0.1
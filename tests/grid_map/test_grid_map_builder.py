@@ -69,3 +69,18 @@ def test_large_mesh_performance():
 
     assert len(nodes) == exp_nodes
     assert G.number_of_edges() == exp_edges
+
+def test_integer_index_tables_match_coords():
+    width, length, spacing = 3.5, 2.5, 0.5
+    G, nodes = build_grid_x_graph(width, length, spacing)
+    Nx, Ny, _, _ = expected_counts(width, length, spacing)
+    corner_id = G.graph['corner_id']
+    center_id = G.graph['center_id']
+    coords = G.graph['coords']
+
+    assert corner_id.shape == (Nx + 1, Ny + 1)
+    assert center_id.shape == (Nx, Ny)
+    for i, j in [(0, 0), (Nx, Ny), (2, 3)]:
+        assert tuple(coords[corner_id[i, j]]) == G.nodes[int(corner_id[i, j])]['coord']
+    assert G.has_edge(int(center_id[0, 0]), int(corner_id[1, 1]))
+    assert G.has_edge(int(corner_id[0, 0]), int(corner_id[1, 0]))
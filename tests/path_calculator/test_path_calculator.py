@@ -5,16 +5,15 @@ Unit tests for path_calculator.find_path using a simple grid graph.
 import math
 import pytest
 import networkx as nx
-from tello_obstacle_detection.gird_map.grid_map_builder import build_grid_x_graph
-from tello_obstacle_detection.path_calculator.path_calculator import find_path
+from tello_obstacle_detection.path_calculator.path_calculator import find_path, path_re_planner
 
 
-def test_straight_line_path():
+def test_straight_line_path(cached_grid):
     """
     On a 2×2 m grid with 1 m spacing, the shortest path from (0,0) to (1,2)
     should follow the straight column of corner‐to‐corner edges.
     """
-    G, nodes = build_grid_x_graph(width=2, length=2, spacing=1)
+    G, nodes = cached_grid(width=2, length=2, spacing=1)
     path = find_path(G, nodes, start=(0, 0), goal=(1, 2))
     assert path == [
         (0.0, 0),
@@ -24,12 +23,12 @@ def test_straight_line_path():
     ]
 
 
-def test_diagonal_path_goes_through_center():
+def test_diagonal_path_goes_through_center(cached_grid):
     """
     On a 1×1 m grid with 1 m spacing, going from the SW corner (–0.5, 0)
     to the NE corner (0.5, 1) must pass through the cell center (0, 0.5).
     """
-    G, nodes = build_grid_x_graph(width=1, length=1, spacing=1)
+    G, nodes = cached_grid(width=1, length=1, spacing=1)
     start = (-0.5, 0.0)
     goal  = (0.5,  1.0)
     path = find_path(G, nodes, start=start, goal=goal)
@@ -40,12 +39,12 @@ def test_diagonal_path_goes_through_center():
     ]
 
 
-def test_snapping_of_off_grid_points():
+def test_snapping_of_off_grid_points(cached_grid):
     """
     If start/goal aren’t exactly on nodes, they snap to the nearest node
     before pathfinding. On a 1×1 grid, (0.2,0.3) → (–0.5,0) and (0.2,0.8) → (–0.5,1).
     """
-    G, nodes = build_grid_x_graph(width=1, length=1, spacing=1)
+    G, nodes = cached_grid(width=1, length=1, spacing=1)
     # Both off by small amounts
     path = find_path(G, nodes, start=(0.2, 0.3), goal=(0.2, 0.8))
     assert path == [
@@ -67,3 +66,69 @@ def test_no_path_raises_when_disconnected():
 
     with pytest.raises(nx.NetworkXNoPath):
         find_path(G, nodes, start=(0.0, 0.0), goal=(1.0, 1.0))
+
+
+def test_repeated_query_reuses_cached_plan(cached_grid):
+    """
+    A second query that snaps to the same start/goal nodes is served from the
+    per-graph plan cache and returns an independent copy of the route.
+    """
+    G, nodes = cached_grid(width=2, length=2, spacing=1)
+    first = find_path(G, nodes, start=(0, 0), goal=(1, 2))
+    first.append((9.0, 9.0))
+    second = find_path(G, nodes, start=(0.1, 0.1), goal=(1, 1.9))
+    assert second == [(0.0, 0), (0.5, 0.5), (1.0, 1), (1.0, 2)]
+    assert len(G.graph['plans']) == 1
+
+
+def test_re_planner_returns_empty_path_unchanged():
+    """
+    With nothing left to re-plan, path_re_planner hands the empty path back
+    instead of indexing its (missing) goal.
+    """
+    assert path_re_planner("right", [], position=(0.0, 0.0)) == []
+
+
+def test_grid_snap_matches_nearest_node_scan(cached_grid):
+    """
+    The cell-local snap used on grid graphs picks the same node as a full
+    nearest-node scan, including off-grid points and exact ties.
+    """
+    G, nodes = cached_grid(width=3, length=2, spacing=0.5)
+    points = [(0.2, 0.3), (0.25, 0.25), (-0.75, 1.0), (5.0, -1.0), (-9.0, 9.0), (0.0, 0.0)]
+    for px, py in points:
+        expected = min(nodes.values(), key=lambda i: math.hypot(
+            G.nodes[i]['coord'][0] - px, G.nodes[i]['coord'][1] - py))
+        path = find_path(G, nodes, start=(px, py), goal=(px, py))
+        assert path == [G.nodes[expected]['coord']]
+
+
+def test_hand_built_graph_with_non_contiguous_ids():
+    """
+    Graphs not built by build_grid_x_graph may use any node ids; find_path
+    snaps through the nodes mapping instead of assuming ids 0..N-1.
+    """
+    G = nx.Graph()
+    G.add_node(10, coord=(0.0, 0.0))
+    G.add_node(20, coord=(1.0, 0.0))
+    G.add_edge(10, 20, weight=1.0)
+    nodes = {(0.0, 0.0): 10, (1.0, 0.0): 20}
+
+    assert find_path(G, nodes, start=(0.1, 0.0), goal=(0.9, 0.1)) == [(0.0, 0.0), (1.0, 0.0)]
+
+
+def test_hand_built_graph_edits_are_seen_by_next_query():
+    """
+    Nothing is cached on caller-owned graphs: after an edge is added, the
+    next query finds the route that was previously missing.
+    """
+    G = nx.Graph()
+    G.add_node(0, coord=(0.0, 0.0))
+    G.add_node(1, coord=(1.0, 1.0))
+    nodes = {(0.0, 0.0): 0, (1.0, 1.0): 1}
+
+    with pytest.raises(nx.NetworkXNoPath):
+        find_path(G, nodes, start=(0.0, 0.0), goal=(1.0, 1.0))
+    G.add_edge(0, 1, weight=math.sqrt(2))
+    assert find_path(G, nodes, start=(0.0, 0.0), goal=(1.0, 1.0)) == [(0.0, 0.0), (1.0, 1.0)]
+    assert 'adjacency' not in G.graph and 'plans' not in G.graph
@@ -0,0 +1,16 @@
+import logging
+
+from tello_obstacle_detection.main import setup_logging, teardown_logging
+
+
+def test_repeated_logging_setup_leaves_one_queue_handler():
+    root = logging.getLogger()
+    before = list(root.handlers)
+
+    for _ in range(3):
+        listener = setup_logging()
+        assert len(root.handlers) == len(before) + 1
+        logging.getLogger("tello_obstacle_detection.test").info("mission start")
+        teardown_logging(listener)
+
+    assert root.handlers == before